@@ -0,0 +1,237 @@
+import argparse
+import glob
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import numpy
+import pandas as pd
+
+# Streaming analytics over the session logs (data/attempt*.csv).
+#
+# Every file is read in fixed-size chunks and reduced to a SessionStats:
+# a mergeable reaction-time sketch plus correct/tie/try counts per
+# (left, right, distribution) group. Files are scanned in a process pool and the
+# per-file stats are merged, so memory depends on the chunk size, not on the
+# number of rounds.
+
+GROUP_COLUMNS = ["left", "right", "distribution"]
+UNKNOWN = "unknown"   # group value for logs written before the column existed
+
+
+class ReactionSketch:
+    """Mergeable histogram of reaction times (seconds) with log-spaced buckets.
+
+    Each bucket spans a ratio of gamma = (1 + alpha) / (1 - alpha), so every
+    quantile is within `alpha` relative error however many values are added.
+    Merging two sketches just adds their counts.
+    """
+    def __init__(self, alpha=0.01, min_value=1e-3, max_value=3600.0):
+        self.alpha = alpha
+        self.min_value = min_value
+        self.max_value = max_value
+        self.log_gamma = math.log((1 + alpha) / (1 - alpha))
+        self.offset = math.ceil(math.log(min_value) / self.log_gamma)
+        nbins = math.ceil(math.log(max_value) / self.log_gamma) - self.offset + 1
+        self.counts = numpy.zeros(nbins, dtype=numpy.int64)
+        self.total = 0
+        self.sum = 0.0
+
+    def add(self, values):
+        values = numpy.asarray(values, dtype=float)
+        values = values[numpy.isfinite(values) & (values >= 0)]
+        if not len(values):
+            return
+        clipped = numpy.clip(values, self.min_value, self.max_value)
+        idx = numpy.ceil(numpy.log(clipped) / self.log_gamma).astype(numpy.int64) - self.offset
+        numpy.clip(idx, 0, len(self.counts) - 1, out=idx)
+        self.counts += numpy.bincount(idx, minlength=len(self.counts))
+        self.total += len(values)
+        self.sum += float(values.sum())
+
+    def merge(self, other):
+        if (other.alpha, other.min_value, other.max_value) != (self.alpha, self.min_value, self.max_value):
+            raise ValueError("cannot merge sketches with different parameters")
+        self.counts += other.counts
+        self.total += other.total
+        self.sum += other.sum
+
+    def bin_values(self):
+        # midpoint (in relative terms) of each bucket (gamma^(i-1), gamma^i]
+        gamma = math.exp(self.log_gamma)
+        i = numpy.arange(len(self.counts)) + self.offset
+        return 2 * numpy.exp(i * self.log_gamma) / (gamma + 1)
+
+    def quantile(self, q, counts=None):
+        # counts may be a (replicates, bins) array of resampled counts
+        counts = self.counts if counts is None else counts
+        cum = numpy.cumsum(counts, axis=-1)
+        rank = q * (cum[..., -1:] - 1)
+        idx = (cum <= rank).sum(axis=-1)
+        return self.bin_values()[numpy.minimum(idx, len(self.counts) - 1)]
+
+    def mean(self):
+        return self.sum / self.total if self.total else float("nan")
+
+
+class SessionStats:
+    """Per-file (or merged) summary of session logs; cheap to pickle and merge."""
+    def __init__(self, alpha=0.01):
+        self.sketch = ReactionSketch(alpha)
+        self.groups = {}   # (left, right, distribution) -> [tries, correct, ties]
+        self.files = 0
+        self.rows = 0
+        self.errors = {}   # path -> message for files that could not be read
+
+    def add_chunk(self, chunk):
+        self.rows += len(chunk)
+        self.sketch.add(chunk["time"].to_numpy(dtype=float, na_value=numpy.nan))
+
+        # result labels are categorical: classify each category once, then index by code
+        result = chunk["result"].astype("category")
+        labels = [str(c).lower() for c in result.cat.categories] + [""]   # code -1 (missing) -> ""
+        is_correct = numpy.array([l.startswith("correct") for l in labels])[result.cat.codes.to_numpy()]
+        is_tie = numpy.array([l.startswith("tie") for l in labels])[result.cat.codes.to_numpy()]
+
+        # combine the group columns' codes into one key per row
+        key = numpy.zeros(len(chunk), dtype=numpy.int64)
+        names = []
+        for col in GROUP_COLUMNS:
+            if col in chunk:
+                values = chunk[col].astype("category")
+                cats = [str(c) for c in values.cat.categories] + [UNKNOWN]
+                codes = values.cat.codes.to_numpy().astype(numpy.int64) % len(cats)  # -1 -> UNKNOWN
+            else:
+                cats = [UNKNOWN]
+                codes = numpy.zeros(len(chunk), dtype=numpy.int64)
+            key = key * len(cats) + codes
+            names.append(cats)
+
+        uniq, inverse = numpy.unique(key, return_inverse=True)
+        tries = numpy.bincount(inverse, minlength=len(uniq))
+        correct = numpy.bincount(inverse, weights=is_correct, minlength=len(uniq))
+        ties = numpy.bincount(inverse, weights=is_tie, minlength=len(uniq))
+        for k, t, c, d in zip(uniq.tolist(), tries, correct, ties):
+            group = []
+            for cats in reversed(names):
+                k, code = divmod(k, len(cats))
+                group.append(cats[code])
+            counts = self.groups.setdefault(tuple(reversed(group)), [0, 0, 0])
+            counts[0] += int(t)
+            counts[1] += int(c)
+            counts[2] += int(d)
+
+    def merge(self, other):
+        self.sketch.merge(other.sketch)
+        for group, (t, c, d) in other.groups.items():
+            counts = self.groups.setdefault(group, [0, 0, 0])
+            counts[0] += t
+            counts[1] += c
+            counts[2] += d
+        self.files += other.files
+        self.rows += other.rows
+        self.errors.update(other.errors)
+
+
+def scan_file(path, chunk_rows=1 << 20, alpha=0.01):
+    """Reduce one session log to SessionStats, reading `chunk_rows` rows at a time."""
+    stats = SessionStats(alpha)
+    try:
+        header = pd.read_csv(path, nrows=0).columns
+        groups = [c for c in GROUP_COLUMNS if c in header]
+        dtypes = {"time": "float64", "result": "category", **{c: "category" for c in groups}}
+        for chunk in pd.read_csv(path, usecols=["time", "result", *groups], dtype=dtypes,
+                                 chunksize=chunk_rows):
+            stats.add_chunk(chunk)
+        stats.files = 1
+    except Exception as e:
+        # drop whatever was read before the failure, like the notebook skips unreadable files
+        stats = SessionStats(alpha)
+        stats.errors[path] = str(e)
+    return stats
+
+
+def analyze(data_dir="data", workers=None, chunk_rows=1 << 20, alpha=0.01):
+    """Scan every attempt*.csv under data_dir in a process pool and merge the results."""
+    paths = sorted(glob.glob(os.path.join(data_dir, "attempt*.csv")))
+    total = SessionStats(alpha)
+    if workers == 1 or len(paths) < 2:
+        for p in paths:
+            total.merge(scan_file(p, chunk_rows, alpha))
+        return total
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        for stats in ex.map(scan_file, paths, repeat(chunk_rows), repeat(alpha)):
+            total.merge(stats)
+    return total
+
+
+def _interval(samples, ci):
+    tail = (1 - ci) / 2 * 100
+    lo, hi = numpy.percentile(samples, [tail, 100 - tail])
+    return float(lo), float(hi)
+
+
+def summarize(stats, percentiles=(50, 90, 99), n_boot=1000, ci=0.95, seed=0):
+    """Overall and per-group results with bootstrap confidence intervals.
+
+    Resampling n rounds with replacement gives a Binomial(n, p) number of
+    correct guesses, and multinomial counts over the sketch buckets for the
+    reaction times, so the bootstrap never needs the raw rows.
+    Resampled percentiles can only land on bucket values, so with many rounds
+    their spread collapses to one bucket; percentile bounds are therefore
+    widened by the sketch's relative error `alpha` on each side.
+    Returns (overall, groups): a one-row DataFrame and one row per group.
+    """
+    rng = numpy.random.default_rng(seed)
+    sketch = stats.sketch
+
+    tries = sum(t for t, _, _ in stats.groups.values())
+    correct = sum(c for _, c, _ in stats.groups.values())
+    overall = {"files": stats.files, "rounds": tries, "correct": correct,
+               "accuracy": correct / tries if tries else float("nan")}
+    if tries:
+        overall["accuracy_low"], overall["accuracy_high"] = _interval(
+            rng.binomial(tries, correct / tries, n_boot) / tries, ci)
+
+    overall["mean_time"] = sketch.mean()
+    if sketch.total:
+        boot = rng.multinomial(sketch.total, sketch.counts / sketch.total, size=n_boot)
+        overall["mean_time_low"], overall["mean_time_high"] = _interval(
+            boot @ sketch.bin_values() / sketch.total, ci)
+        for p in percentiles:
+            overall[f"p{p}"] = float(sketch.quantile(p / 100))
+            low, high = _interval(sketch.quantile(p / 100, boot), ci)
+            overall[f"p{p}_low"] = low * (1 - sketch.alpha)
+            overall[f"p{p}_high"] = high * (1 + sketch.alpha)
+
+    rows = []
+    for (left, right, dist), (t, c, d) in sorted(stats.groups.items()):
+        acc = c / t
+        low, high = _interval(rng.binomial(t, acc, n_boot) / t, ci)
+        rows.append({"left": left, "right": right, "distribution": dist, "tries": t,
+                     "correct": c, "ties": d, "accuracy": acc,
+                     "accuracy_low": low, "accuracy_high": high})
+    columns = GROUP_COLUMNS + ["tries", "correct", "ties", "accuracy", "accuracy_low", "accuracy_high"]
+    return pd.DataFrame([overall]), pd.DataFrame(rows, columns=columns)
+
+
+def _main():
+    parser = argparse.ArgumentParser(description="Summarize all session logs.")
+    parser.add_argument("data_dir", nargs="?", default="data")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-rows", type=int, default=1 << 20)
+    parser.add_argument("--boot", type=int, default=1000)
+    args = parser.parse_args()
+
+    stats = analyze(args.data_dir, args.workers, args.chunk_rows)
+    overall, groups = summarize(stats, n_boot=args.boot)
+    with pd.option_context("display.width", 160, "display.max_columns", None):
+        print(overall.T.to_string(header=False))
+        print()
+        print(groups.to_string(index=False))
+    for path, message in stats.errors.items():
+        print(f"Skipping {path}: {message}")
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,59 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")   # headless instances, no window
+
+import argparse
+import gc
+import tracemalloc
+import numpy
+from config import HEIGHT, dataPoints
+from visualization import Visualization
+
+
+def bytes_per_instance(instances, points, payload_width=0):
+    # traced Python/NumPy allocations for `instances` resident simulations, divided out
+    data = numpy.random.randint(10, HEIGHT - 100, points)
+    sims = [None] * instances          # keep the list itself out of the measurement
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for k in range(instances):
+        sims[k] = Visualization(dataLength=data, screen=None, payload_width=payload_width)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used / instances
+
+
+def bytes_per_reset(rounds, points):
+    # bytes still allocated after `rounds` resets of one instance, per reset
+    data = numpy.random.randint(10, HEIGHT - 100, points)
+    vis = Visualization(dataLength=data, screen=None)
+    vis.reset(data)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    peak_start = tracemalloc.get_traced_memory()[1]
+    for _ in range(rounds):
+        vis.reset(data)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (current - before) / rounds, peak - peak_start
+
+
+def _main():
+    parser = argparse.ArgumentParser(description="Memory per headless Visualization instance.")
+    parser.add_argument("--instances", type=int, default=100_000)
+    parser.add_argument("--points", type=int, nargs="*", default=[dataPoints, 200])
+    parser.add_argument("--payload", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{args.instances} instances, payload {args.payload} bytes")
+    for points in args.points:
+        per = bytes_per_instance(args.instances, points, args.payload)
+        total = per * args.instances / 2**20
+        print(f"{points:>5} bars  {per:8.0f} B/instance  {total:8.1f} MiB total")
+    per_reset, peak = bytes_per_reset(10_000, dataPoints)
+    print(f"reset(): {per_reset:.1f} B retained per call, {peak} B peak over 10000 calls")
+
+
+if __name__ == "__main__":
+    _main()
@@ -12,9 +12,20 @@ RED = (255, 0, 0)
 GREEN = (34, 255, 0)
 WHITE_TRANS = (255, 255, 255, 40)
 
+# one color per worker lane in the parallel algorithms
+LANE_COLORS = [(0, 170, 255), (255, 200, 0), (200, 0, 255), (0, 230, 200),
+               (255, 120, 0), (120, 255, 120), (255, 80, 160), (160, 160, 255)]
+
 FPS = 60
 
 dataPoints = 20
+# how base_data is drawn (logged with every round): one of dataDistributions,
+# or "mixed" to pick one at random each round
+dataDistributions = ["uniform", "sorted", "reversed", "nearly_sorted"]
+dataDistribution = "uniform"
+
+# bytes of payload carried by each bar (0 = plain integers); wider records make swaps slower
+payloadWidth = 0
 
 SPEED_FACTOR = 0.35
 
@@ -24,4 +35,8 @@ prediction = None
 result_text = ""
 result_printed = False
 
-algorithms = [1, 2, 3, 4, 5]
\ No newline at end of file
+algorithms = [1, 2, 3, 4, 5, 6, 7, 8]
+
+# bitonic, odd-even merge and parallel merge sort race with a random core count
+parallelAlgorithms = [6, 7, 8]
+coreChoices = [1, 2, 4, 8]
\ No newline at end of file
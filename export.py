@@ -0,0 +1,277 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")   # no window needed for export
+
+import argparse
+import queue
+import random
+import shlex
+import subprocess
+import struct
+import threading
+import zlib
+import numpy
+import pygame
+from config import *
+from timer import format_time
+from visualization import Visualization, make_base_data
+
+
+class VirtualClock:
+    """tick source for Visualization that only moves when told to (ms, like pygame ticks)."""
+    def __init__(self, fps=FPS):
+        self.fps = fps
+        self.frame = 0
+
+    def tick(self):
+        self.frame += 1
+
+    def __call__(self):
+        return self.frame * 1000 // self.fps
+
+
+# RGBX byte order: a frame copied straight from the surface is already rgb0 for encoders
+RGBX_MASKS = (0xFF, 0xFF00, 0xFF0000, 0)
+
+
+def encode_png(pixels, level=1):
+    """encode an (h, w, 3) RGB or (h, w, 4) RGBX uint8 frame as an RGB PNG.
+
+    zlib releases the GIL while compressing, so frames encode in parallel threads.
+    """
+    h, w, _ = pixels.shape
+    rows = numpy.zeros((h, w * 3 + 1), dtype=numpy.uint8)   # filter byte 0 per row
+    rgb = rows[:, 1:].reshape(h, w, 3)                     # view into rows, not a copy
+    rgb[...] = pixels[:, :, :3]
+
+    def chunk(tag, body):
+        return (struct.pack(">I", len(body)) + tag + body
+                + struct.pack(">I", zlib.crc32(tag + body) & 0xFFFFFFFF))
+
+    header = struct.pack(">IIBBBBB", w, h, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(rows, level)) + chunk(b"IEND", b""))
+
+
+class FrameWriter:
+    """Bounded producer/consumer pipeline for rendered frames.
+
+    Each frame is read through the surface's raw buffer view and copied once, as
+    RGBX, into a fixed pool of buffers; worker threads encode or write them out
+    and hand the buffers back. Memory stays at `queue_size` frames however long the race runs.
+
+    Frames pushed with the same `key` as the previous one are identical, so they
+    are not copied again: the worker encodes the frame once and writes it once per
+    repeat.
+    """
+    def __init__(self, out, size, fmt="png", workers=4, queue_size=8, encoder=None):
+        if fmt not in ("png", "raw"):
+            raise ValueError(f"unknown frame format: {fmt}")
+        self.out = out
+        self.size = size
+        self.fmt = fmt
+        self.count = 0
+        self.errors = []
+
+        w, h = size
+        self.free = queue.Queue()
+        for _ in range(max(1, queue_size)):
+            self.free.put(numpy.empty((h, w, 4), dtype=numpy.uint8))
+        self.jobs = queue.Queue(maxsize=max(1, queue_size))
+
+        self.pending = None    # (first index, buffer, repeats) of the last distinct frame
+        self.last_key = None
+
+        self.proc = None
+        self.sink = None
+        if fmt == "png":
+            os.makedirs(out, exist_ok=True)
+        else:
+            # raw frames have to stay in order, so only one worker feeds the sink
+            workers = 1
+            if encoder:
+                self.proc = subprocess.Popen(encoder, stdin=subprocess.PIPE)
+                self.sink = self.proc.stdin
+            else:
+                self.sink = open(out, "wb")
+
+        self.threads = [threading.Thread(target=self._work, daemon=True)
+                        for _ in range(max(1, workers))]
+        for t in self.threads:
+            t.start()
+
+    def push(self, surface, key=None):
+        """queue one RGBX surface (see RGBX_MASKS); blocks while the pool is full.
+
+        `key` identifies what was drawn; pass None if frames can't be compared.
+        """
+        if self.errors:
+            raise self.errors[0]
+        if key is not None and key == self.last_key and self.pending is not None:
+            idx, buf, repeats = self.pending
+            self.pending = (idx, buf, repeats + 1)
+            self.count += 1
+            return
+
+        self._flush()
+        w, h = self.size
+        buf = self.free.get()
+        view = surface.get_view("0")                 # raw pixel bytes, no copy
+        pixels = numpy.frombuffer(view, dtype=numpy.uint8).reshape(h, surface.get_pitch())
+        numpy.copyto(buf.reshape(h, w * 4), pixels[:, :w * 4])   # contiguous rows, no channel shuffle
+        del pixels, view                             # release the surface lock before next draw
+        self.pending = (self.count, buf, 0)
+        self.last_key = key
+        self.count += 1
+
+    def _flush(self):
+        # a distinct frame is only handed to the workers once its repeats are known
+        if self.pending is not None:
+            self.jobs.put(self.pending)
+            self.pending = None
+
+    def _work(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            idx, buf, repeats = job
+            try:
+                if self.errors:
+                    continue
+                if self.sink is None:
+                    png = encode_png(buf)
+                    for k in range(idx, idx + repeats + 1):
+                        with open(os.path.join(self.out, f"frame{k:06d}.png"), "wb") as f:
+                            f.write(png)
+                else:
+                    for _ in range(repeats + 1):
+                        self.sink.write(buf)
+            except Exception as e:
+                self.errors.append(e)
+            finally:
+                self.free.put(buf)
+
+    def close(self):
+        if not self.errors:
+            self._flush()
+        for _ in self.threads:
+            self.jobs.put(None)
+        for t in self.threads:
+            t.join()
+        try:
+            if self.sink is not None:
+                self.sink.close()
+        except BrokenPipeError:
+            if self.proc is None:
+                raise
+        finally:
+            # always reap the encoder; its exit code explains a broken pipe better than the pipe does
+            if self.proc is not None and self.proc.wait() != 0:
+                self.errors.insert(0, RuntimeError(f"encoder exited with code {self.proc.returncode}"))
+        if self.errors:
+            raise self.errors[0]
+
+
+def export_race(out, left_algo, right_algo, data=None, fps=FPS, fmt="png", workers=4,
+                queue_size=8, encoder=None, max_frames=None, speed_up=False,
+                payload_width=payloadWidth, timer=False, left_cores=None, right_cores=None):
+    """Render a left/right race on a virtual clock and stream the frames to `out`.
+
+    `out` is a directory for a PNG sequence, or a file for raw rgb0 frames (RGBX, 4 bytes
+    per pixel) when fmt="raw" (ignored if `encoder` is given; raw frames are then piped
+    to its stdin).
+    The clock is only drawn with timer=True. It changes every frame, so every frame is
+    then encoded; without it, frames between two steps are identical and only encoded
+    once. left_cores / right_cores set the simulated cores of the
+    parallel algorithms; None picks one at random, like the game does.
+    Returns the number of frames written.
+    """
+    pygame.font.init()
+    font = pygame.font.SysFont(None, 24)
+    clock = VirtualClock(fps)
+
+    if data is None:
+        data, _ = make_base_data()
+
+    surface = pygame.Surface((WIDTH, HEIGHT), 0, 32, RGBX_MASKS)
+    left_width = WIDTH // 2
+    right_width = WIDTH - left_width
+    left_vis = Visualization(dataLength=data, screen=surface, x_offset=0,
+                             column_width=left_width, clock=clock, payload_width=payload_width)
+    right_vis = Visualization(dataLength=data, screen=surface, x_offset=left_width,
+                              column_width=right_width, clock=clock, payload_width=payload_width)
+    left_vis.setWorkers(left_algo)
+    right_vis.setWorkers(right_algo)
+    if left_cores is not None:
+        left_vis.workers = left_cores
+    if right_cores is not None:
+        right_vis.workers = right_cores
+    if speed_up:
+        left_vis.speedUp()
+        right_vis.speedUp()
+
+    writer = FrameWriter(out, (WIDTH, HEIGHT), fmt=fmt, workers=workers,
+                         queue_size=queue_size, encoder=encoder)
+    try:
+        while max_frames is None or writer.count < max_frames:
+            surface.fill(BLACK)
+            pygame.draw.line(surface, WHITE, (left_width, 0), (left_width, HEIGHT - 80), 2)
+            pygame.draw.line(surface, WHITE, (0, HEIGHT - 70), (WIDTH, HEIGHT - 70), 5)
+
+            left_vis.render_step(left_algo)
+            right_vis.render_step(right_algo)
+            left_vis.render_title(font)
+            right_vis.render_title(font)
+
+            time_label = f"{format_time(clock())} (s)" if timer else ""
+            if timer:
+                timer_text = font.render(time_label, True, WHITE)
+                surface.blit(timer_text, (WIDTH - 160, HEIGHT - 40))
+
+            # everything that was drawn: equal keys mean identical frames
+            key = tuple((vis.name, vis.keys.tobytes(), vis.states.tobytes(), vis.lanes.tobytes())
+                        for vis in (left_vis, right_vis)) + (time_label,)
+            writer.push(surface, key)
+            if left_vis.done and right_vis.done:
+                break
+            clock.tick()
+    finally:
+        writer.close()
+    return writer.count
+
+
+def _main():
+    parser = argparse.ArgumentParser(description="Export a sorting race to video frames.")
+    parser.add_argument("out", help="output directory (png) or file (raw)")
+    parser.add_argument("--left", type=int, default=1, choices=algorithms)
+    parser.add_argument("--right", type=int, default=2, choices=algorithms)
+    parser.add_argument("--fps", type=int, default=FPS)
+    parser.add_argument("--format", dest="fmt", default="png", choices=["png", "raw"])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--queue-size", type=int, default=8)
+    parser.add_argument("--encoder", default=None,
+                        help="command that reads raw rgb0 frames on stdin, e.g. ffmpeg -pix_fmt rgb0")
+    parser.add_argument("--max-frames", type=int, default=None)
+    parser.add_argument("--left-cores", type=int, default=None,
+                        help="simulated cores for a parallel left algorithm (default: random)")
+    parser.add_argument("--right-cores", type=int, default=None,
+                        help="simulated cores for a parallel right algorithm (default: random)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--timer", action="store_true",
+                        help="draw the clock; every frame then differs and has to be encoded")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        numpy.random.seed(args.seed)
+        random.seed(args.seed)
+    encoder = shlex.split(args.encoder) if args.encoder else None
+    fmt = "raw" if encoder else args.fmt
+    frames = export_race(args.out, args.left, args.right, fps=args.fps, fmt=fmt,
+                         workers=args.workers, queue_size=args.queue_size,
+                         encoder=encoder, max_frames=args.max_frames, timer=args.timer,
+                         left_cores=args.left_cores, right_cores=args.right_cores)
+    print(f"wrote {frames} frames")
+
+
+if __name__ == "__main__":
+    _main()
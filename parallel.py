@@ -0,0 +1,265 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+import numpy
+
+# Parallel sorting algorithms.
+#
+# The sorting networks (bitonic, odd-even merge) are described as a list of
+# stages; every stage is a set of disjoint compare-exchange pairs (lo, hi) with
+# lo < hi, so any split of a stage between workers is safe. All comparators put
+# the smaller value at lo, which lets a network for the next power of two sort
+# any n: comparators that reach past the end are simply dropped.
+#
+# Nothing in here imports pygame, so process pool workers stay light.
+
+
+# --- Bitonic sort ---
+def bitonic_stages(n):
+    # ("flip", k) opens each merge of 2 sorted k/2 blocks, ("half", j) are the half-cleaners
+    stages = []
+    k = 2
+    while k // 2 < n:
+        stages.append(("flip", k))
+        j = k // 4
+        while j >= 1:
+            stages.append(("half", j))
+            j //= 2
+        k *= 2
+    return stages
+
+def bitonic_pairs(stage, n, start=0, stop=None):
+    kind, k = stage
+    lo = numpy.arange(start, n if stop is None else stop)
+    if kind == "flip":
+        offset = lo % k
+        lo = lo[offset < k // 2]
+        hi = lo - 2 * (lo % k) + k - 1
+    else:
+        lo = lo[(lo & k) == 0]
+        hi = lo + k
+    keep = hi < n
+    return lo[keep], hi[keep]
+
+
+# --- Odd-even merge sort (Batcher) ---
+def odd_even_stages(n):
+    stages = []
+    p = 1
+    while p < n:
+        k = p
+        while k >= 1:
+            stages.append((p, k))
+            k //= 2
+        p *= 2
+    return stages
+
+def odd_even_pairs(stage, n, start=0, stop=None):
+    p, k = stage
+    lo = numpy.arange(max(start, k % p), min(n - k, n if stop is None else stop))
+    keep = ((lo - k % p) % (2 * k) < k) & (lo // (2 * p) == (lo + k) // (2 * p))
+    lo = lo[keep]
+    return lo, lo + k
+
+
+NETWORKS = {
+    "bitonic": (bitonic_stages, bitonic_pairs),
+    "odd_even": (odd_even_stages, odd_even_pairs),
+}
+
+def network_pairs(name, n):
+    """all stages of a network as a list of (lo, hi) index arrays."""
+    stages, pairs = NETWORKS[name]
+    return [pairs(stage, n) for stage in stages(n)]
+
+
+# --- Bottom-up merge ---
+def merge_levels(n, run=1):
+    """bottom-up merge jobs (left, mid, right) grouped by level; jobs in one level are independent."""
+    levels = []
+    size = run
+    while size < n:
+        level = []
+        for left in range(0, n, 2 * size):
+            mid = min(left + size - 1, n - 1)
+            right = min(left + 2 * size - 1, n - 1)
+            if mid < right:
+                level.append((left, mid, right))
+        levels.append(level)
+        size *= 2
+    return levels
+
+
+# --- Shared buffers ---
+# Thread workers get the numpy array itself; process workers get (name, n, dtype)
+# and attach to the shared memory block once per process.
+_attached = {}
+
+def _view(ref):
+    if isinstance(ref, numpy.ndarray):
+        return ref
+    name, n, dtype = ref
+    if name not in _attached:
+        shm = shared_memory.SharedMemory(name=name)
+        _attached[name] = (shm, numpy.ndarray((n,), dtype=dtype, buffer=shm.buf))
+    return _attached[name][1]
+
+class SharedBuffer:
+    def __init__(self, n, dtype, shared):
+        dtype = numpy.dtype(dtype)
+        self.shm = None
+        if shared:
+            self.shm = shared_memory.SharedMemory(create=True, size=max(1, n * dtype.itemsize))
+            self.array = numpy.ndarray((n,), dtype=dtype, buffer=self.shm.buf)
+            self.ref = (self.shm.name, n, dtype.str)
+        else:
+            self.array = numpy.empty((n,), dtype=dtype)
+            self.ref = self.array
+
+    def close(self):
+        self.array = None
+        self.ref = None
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+
+
+# --- Pool jobs ---
+def _sort_job(ref, start, stop):
+    _view(ref)[start:stop].sort()
+
+def _exchange_job(ref, name, stage, start, stop):
+    buf = _view(ref)
+    lo, hi = NETWORKS[name][1](stage, len(buf), start, stop)
+    a = buf[lo]
+    b = buf[hi]
+    buf[lo] = numpy.minimum(a, b)
+    buf[hi] = numpy.maximum(a, b)
+
+def _merge_job(src_ref, dst_ref, l, m, r, start, stop):
+    # scatter src[start:stop] (inside one half of l..r) to its merged position in dst;
+    # ties go to the left half, so the merge is stable
+    src = _view(src_ref)
+    dst = _view(dst_ref)
+    part = src[start:stop]
+    if start <= m:
+        pos = numpy.arange(start - l, stop - l) + numpy.searchsorted(src[m + 1:r + 1], part, "left")
+    else:
+        pos = numpy.arange(start - m - 1, stop - m - 1) + numpy.searchsorted(src[l:m + 1], part, "right")
+    dst[l + pos] = part
+
+
+def _spans(start, stop, pieces):
+    # split start..stop into at most `pieces` contiguous, non-empty spans
+    edges = numpy.linspace(start, stop, pieces + 1).astype(int)
+    return [(a, b) for a, b in zip(edges[:-1], edges[1:]) if a < b]
+
+
+def _run_network(pool, buf, name, workers):
+    n = len(buf.array)
+    for stage in NETWORKS[name][0](n):
+        jobs = [pool.submit(_exchange_job, buf.ref, name, stage, a, b) for a, b in _spans(0, n, workers)]
+        for job in jobs:
+            job.result()
+    return buf
+
+def _run_merge(pool, buf, spare, workers):
+    # sort one run per worker, then merge runs level by level, ping-ponging between buffers
+    n = len(buf.array)
+    run = -(-n // workers)
+    jobs = [pool.submit(_sort_job, buf.ref, a, min(a + run, n)) for a in range(0, n, run)]
+    for job in jobs:
+        job.result()
+
+    src, dst = buf, spare
+    for level in merge_levels(n, run):
+        jobs = []
+        covered = 0
+        for l, m, r in level:
+            # split every merge so a level with fewer jobs than workers still fills the pool
+            for a, b in _spans(l, m + 1, workers) + _spans(m + 1, r + 1, workers):
+                jobs.append(pool.submit(_merge_job, src.ref, dst.ref, l, m, r, a, b))
+            covered = r + 1
+        dst.array[covered:] = src.array[covered:]   # a lone tail run has nothing to merge with
+        for job in jobs:
+            job.result()
+        src, dst = dst, src
+    return src
+
+
+def parallel_sort(data, algo="merge", workers=None, pool="thread"):
+    """Sort a copy of `data` with a parallel algorithm and return it.
+
+    algo is "bitonic", "odd_even" or "merge"; pool is "thread" or "process".
+    Process workers share the data through multiprocessing shared memory.
+    """
+    if algo not in NETWORKS and algo != "merge":
+        raise ValueError(f"unknown parallel algorithm: {algo}")
+    if pool not in ("thread", "process"):
+        raise ValueError(f"unknown pool type: {pool}")
+    data = numpy.asarray(data)
+    workers = max(1, workers or os.cpu_count() or 1)
+    n = len(data)
+    if n < 2:
+        return data.copy()
+
+    shared = pool == "process"
+    buf = SharedBuffer(n, data.dtype, shared)
+    spare = SharedBuffer(n, data.dtype, shared) if algo == "merge" else None
+    executor = ProcessPoolExecutor if shared else ThreadPoolExecutor
+    try:
+        buf.array[:] = data
+        with executor(max_workers=workers) as ex:
+            if algo == "merge":
+                result = _run_merge(ex, buf, spare, workers)
+            else:
+                result = _run_network(ex, buf, algo, workers)
+        return result.array.copy()
+    finally:
+        buf.close()
+        if spare is not None:
+            spare.close()
+
+
+def measure_speedup(n=1 << 20, algo="merge", worker_counts=None, pool="thread", repeat=3, seed=0):
+    """time parallel_sort for each worker count; returns rows of workers, seconds and speedup vs 1 worker."""
+    if worker_counts is None:
+        cores = os.cpu_count() or 1
+        worker_counts = [1]
+        while worker_counts[-1] * 2 <= cores:
+            worker_counts.append(worker_counts[-1] * 2)
+    data = numpy.random.default_rng(seed).integers(0, 1 << 30, n)
+
+    rows = []
+    base = None
+    for w in worker_counts:
+        best = None
+        for _ in range(repeat):
+            t = time.perf_counter()
+            parallel_sort(data, algo, workers=w, pool=pool)
+            elapsed = time.perf_counter() - t
+            best = elapsed if best is None else min(best, elapsed)
+        if base is None:
+            base = best
+        rows.append({"workers": w, "seconds": best, "speedup": base / best})
+    return rows
+
+
+def _main():
+    parser = argparse.ArgumentParser(description="Measure parallel sorting speedup against core count.")
+    parser.add_argument("--n", type=int, default=1 << 20)
+    parser.add_argument("--algo", default="merge", choices=["merge", *NETWORKS])
+    parser.add_argument("--pool", default="thread", choices=["thread", "process"])
+    parser.add_argument("--workers", type=int, nargs="*", default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{args.algo} sort, n={args.n}, {args.pool} pool")
+    for row in measure_speedup(args.n, args.algo, args.workers, args.pool, args.repeat):
+        print(f"{row['workers']:>3} workers  {row['seconds']:8.3f} s  x{row['speedup']:.2f}")
+
+
+if __name__ == "__main__":
+    _main()
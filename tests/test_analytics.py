@@ -0,0 +1,98 @@
+import os, sys
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+import pandas as pd
+import pytest
+from analytics import ReactionSketch, SessionStats, scan_file, analyze, summarize
+
+
+def write_log(path, times, results, left=None, right=None, dist=None):
+    df = pd.DataFrame({"id": range(1, len(times) + 1), "time": times, "result": results})
+    if left is not None:
+        df["left"], df["right"], df["distribution"] = left, right, dist
+    df.to_csv(path, index=False)
+
+
+# ---------- Sketch ----------
+def test_sketch_quantiles_within_relative_error():
+    values = np.random.default_rng(0).lognormal(0.5, 0.6, 50000)
+    sketch = ReactionSketch(alpha=0.01)
+    sketch.add(values)
+    for q in (0.1, 0.5, 0.9, 0.99):
+        exact = np.quantile(values, q)
+        assert abs(sketch.quantile(q) - exact) / exact < 0.02
+    assert sketch.mean() == pytest.approx(values.mean())
+
+
+def test_sketch_merge_matches_single_sketch():
+    values = np.random.default_rng(1).uniform(0.1, 5, 1000)
+    whole, a, b = ReactionSketch(), ReactionSketch(), ReactionSketch()
+    whole.add(values)
+    a.add(values[:300])
+    b.add(values[300:])
+    a.merge(b)
+    assert (a.counts == whole.counts).all() and a.total == whole.total
+
+
+def test_sketch_ignores_missing_values():
+    sketch = ReactionSketch()
+    sketch.add([1.0, np.nan, -2.0])
+    assert sketch.total == 1
+
+
+# ---------- Scanning ----------
+def test_chunked_scan_matches_whole_file(tmp_path):
+    path = tmp_path / "attempt1.csv"
+    write_log(path, [0.5, 1.2, 0.9, 2.0, 1.1],
+              ["Correct", "Incorrect", "Correct", "Tie", "Correct"],
+              left=["Bubble Sort", "Bubble Sort", "Quick sort", "Quick sort", "Bubble Sort"],
+              right=["Merge sort"] * 5, dist=["uniform"] * 5)
+    chunked = scan_file(str(path), chunk_rows=2)
+    whole = scan_file(str(path))
+    assert chunked.groups == whole.groups
+    assert chunked.groups[("Bubble Sort", "Merge sort", "uniform")] == [3, 2, 0]
+    assert chunked.groups[("Quick sort", "Merge sort", "uniform")] == [2, 1, 1]
+    assert (chunked.sketch.counts == whole.sketch.counts).all()
+
+
+def test_analyze_merges_files_and_legacy_logs(tmp_path):
+    write_log(tmp_path / "attempt1.csv", [1.0, 2.0], ["Correct", "Incorrect"])
+    write_log(tmp_path / "attempt2.csv", [1.5], ["Correct"],
+              left=["Bubble Sort"], right=["Quick sort"], dist=["uniform"])
+    (tmp_path / "attempt3.csv").write_text("")
+    for workers in (1, 2):
+        stats = analyze(str(tmp_path), workers=workers)
+        assert stats.files == 2 and stats.rows == 3
+        assert stats.groups[("unknown", "unknown", "unknown")] == [2, 1, 0]
+        assert stats.groups[("Bubble Sort", "Quick sort", "uniform")] == [1, 1, 0]
+        assert list(stats.errors) == [str(tmp_path / "attempt3.csv")]
+
+
+# ---------- Summary ----------
+def test_summarize_confidence_intervals_cover_estimates():
+    rng = np.random.default_rng(2)
+    stats = SessionStats()
+    chunk = pd.DataFrame({
+        "time": rng.lognormal(0, 0.5, 2000),
+        "result": rng.choice(["Correct", "Incorrect"], 2000, p=[0.7, 0.3]),
+        "left": "Bubble Sort", "right": "Quick sort", "distribution": "uniform",
+    })
+    stats.add_chunk(chunk)
+    overall, groups = summarize(stats, n_boot=500)
+    row = overall.iloc[0]
+    assert row["rounds"] == 2000
+    assert row["accuracy_low"] <= row["accuracy"] <= row["accuracy_high"]
+    assert row["mean_time_low"] <= row["mean_time"] <= row["mean_time_high"]
+    assert row["p50_low"] <= row["p50"] <= row["p50_high"]
+    assert groups["tries"].tolist() == [2000]
+
+
+def test_percentile_intervals_do_not_collapse_to_one_bucket():
+    stats = SessionStats(alpha=0.01)
+    stats.sketch.add(np.random.default_rng(3).lognormal(0, 0.5, 2_000_000))
+    row = summarize(stats, n_boot=200)[0].iloc[0]
+    for p in (50, 99):
+        assert row[f"p{p}_low"] < row[f"p{p}"] < row[f"p{p}_high"]
+        assert row[f"p{p}_high"] / row[f"p{p}_low"] > 1.02
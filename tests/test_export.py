@@ -0,0 +1,104 @@
+import os, sys
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import pygame
+import numpy as np
+import pytest
+from config import WIDTH, HEIGHT
+from export import VirtualClock, FrameWriter, RGBX_MASKS, export_race
+
+
+def test_virtual_clock_advances_per_frame():
+    clock = VirtualClock(fps=50)
+    assert clock() == 0
+    clock.tick()
+    clock.tick()
+    assert clock() == 40
+
+
+def test_export_png_sequence(tmp_path):
+    out = tmp_path / "frames"
+    frames = export_race(str(out), 1, 2, data=[3, 1, 2], max_frames=5, workers=2)
+    assert frames == 5
+    files = sorted(os.listdir(out))
+    assert files == [f"frame{i:06d}.png" for i in range(5)]
+    img = pygame.image.load(str(out / files[0]))
+    assert img.get_size() == (WIDTH, HEIGHT)
+
+
+def test_export_raw_runs_until_both_finish(tmp_path):
+    out = tmp_path / "race.raw"
+    frames = export_race(str(out), 4, 5, data=[5, 4, 3, 2, 1], fmt="raw", speed_up=True)
+    assert frames > 1
+    assert os.path.getsize(out) == frames * WIDTH * HEIGHT * 4   # rgb0
+
+
+def test_frame_writer_copies_pixels(tmp_path):
+    surf = pygame.Surface((4, 2), 0, 32, RGBX_MASKS)
+    surf.fill((10, 20, 30))
+    surf.set_at((1, 0), (200, 100, 50))
+    writer = FrameWriter(str(tmp_path / "f.raw"), (4, 2), fmt="raw", queue_size=1)
+    writer.push(surf)
+    writer.push(surf)   # pool of one buffer: must wait for the first frame to be written
+    writer.close()
+    raw = np.fromfile(tmp_path / "f.raw", dtype=np.uint8).reshape(2, 2, 4, 4)
+    assert raw[0, 0, 1, :3].tolist() == [200, 100, 50]
+    assert raw[1, 1, 3, :3].tolist() == [10, 20, 30]
+
+
+def test_frame_writer_rejects_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        FrameWriter(str(tmp_path), (4, 2), fmt="gif")
+
+
+def test_png_keeps_pixels_and_repeats_identical_frames(tmp_path):
+    surf = pygame.Surface((4, 2), 0, 32, RGBX_MASKS)
+    surf.fill((10, 20, 30))
+    surf.set_at((2, 1), (200, 100, 50))
+    writer = FrameWriter(str(tmp_path), (4, 2), fmt="png", workers=2)
+    for _ in range(3):
+        writer.push(surf, key="same")
+    writer.close()
+    assert writer.count == 3
+    frames = [(tmp_path / f"frame{i:06d}.png").read_bytes() for i in range(3)]
+    assert frames[0] == frames[1] == frames[2]
+    img = pygame.image.load(str(tmp_path / "frame000002.png"))
+    assert tuple(img.get_at((2, 1)))[:3] == (200, 100, 50)
+    assert tuple(img.get_at((0, 0)))[:3] == (10, 20, 30)
+
+
+def test_export_encodes_repeated_frames_once_unless_timed(tmp_path):
+    out = tmp_path / "race.raw"
+    frames = export_race(str(out), 1, 2, data=[3, 1, 2], fmt="raw")
+    assert os.path.getsize(out) == frames * WIDTH * HEIGHT * 4
+    raw = np.memmap(out, dtype=np.uint8, mode="r").reshape(frames, -1)
+    # a step every 200 ms at 60 fps: consecutive frames between steps are byte-identical
+    assert (raw[1] == raw[2]).all()
+    del raw
+
+    # the clock changes every frame
+    export_race(str(out), 1, 2, data=[3, 1, 2], fmt="raw", timer=True, max_frames=3)
+    raw = np.memmap(out, dtype=np.uint8, mode="r").reshape(3, -1)
+    assert not (raw[1] == raw[2]).all()
+
+
+def test_encoder_exit_code_is_reported(tmp_path):
+    encoder = [sys.executable, "-c", "import sys; sys.exit(3)"]
+    with pytest.raises(RuntimeError, match="code 3"):
+        export_race(str(tmp_path / "x"), 1, 2, data=[3, 1, 2], fmt="raw",
+                    encoder=encoder, max_frames=50)
+
+
+def test_export_sets_simulated_cores(tmp_path, monkeypatch):
+    import export
+    seen = []
+    original = export.Visualization.render_step
+    def spy(vis, algo):
+        original(vis, algo)
+        seen.append((algo, vis.workers, vis.name))
+    monkeypatch.setattr(export.Visualization, "render_step", spy)
+    export_race(str(tmp_path / "r.raw"), 6, 8, data=[3, 1, 2], fmt="raw", max_frames=1,
+                left_cores=4, right_cores=1)
+    assert seen == [(6, 4, "Bitonic sort (4 cores)"), (8, 1, "Parallel merge sort (1 core)")]
@@ -0,0 +1,48 @@
+import os, sys
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+import pytest
+from parallel import merge_levels, network_pairs, parallel_sort, measure_speedup
+
+
+@pytest.mark.parametrize("name", ["bitonic", "odd_even"])
+@pytest.mark.parametrize("n", [1, 2, 5, 8, 13, 32])
+def test_network_stages_are_disjoint_pairs(name, n):
+    for lo, hi in network_pairs(name, n):
+        touched = np.concatenate([lo, hi])
+        assert len(set(touched.tolist())) == len(touched)
+        assert (lo < hi).all() and (hi < n).all()
+
+
+def test_merge_levels_cover_the_array():
+    levels = merge_levels(6)
+    assert levels == [[(0, 0, 1), (2, 2, 3), (4, 4, 5)], [(0, 1, 3)], [(0, 3, 5)]]
+
+
+@pytest.mark.parametrize("algo", ["bitonic", "odd_even", "merge"])
+@pytest.mark.parametrize("workers", [1, 3])
+@pytest.mark.parametrize("n", [0, 1, 7, 100, 1025])
+def test_parallel_sort_threads(algo, workers, n):
+    data = np.random.default_rng(n).integers(0, 50, n)
+    out = parallel_sort(data, algo, workers=workers)
+    assert out.tolist() == sorted(data.tolist())
+
+
+@pytest.mark.parametrize("algo", ["bitonic", "merge"])
+def test_parallel_sort_processes_share_memory(algo):
+    data = np.random.default_rng(1).integers(0, 1000, 300)
+    out = parallel_sort(data, algo, workers=2, pool="process")
+    assert out.tolist() == sorted(data.tolist())
+
+
+def test_parallel_sort_rejects_unknown_algorithm():
+    with pytest.raises(ValueError):
+        parallel_sort([3, 1, 2], "bogo")
+
+
+def test_measure_speedup_rows():
+    rows = measure_speedup(n=1000, algo="merge", worker_counts=[1, 2], repeat=1)
+    assert [r["workers"] for r in rows] == [1, 2]
+    assert rows[0]["speedup"] == 1.0
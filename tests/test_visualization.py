@@ -18,7 +18,7 @@ class Ticker:
         self.t += self.step
         return self.t
 
-def make_vis(arr, w=640, h=480):
+def make_vis(arr, w=640, h=480, payload_width=0):
     pygame.init()
     surf = pygame.Surface((w, h))
     return Visualization(
@@ -28,7 +28,8 @@ def make_vis(arr, w=640, h=480):
         screen_height=h,
         x_offset=0,
         column_width=w,
-        name=""
+        name="",
+        payload_width=payload_width
     )
 
 def run_to_completion(vis, algo_id, max_steps=20000):
@@ -106,4 +107,155 @@ def test_reset():
     assert vis.quick_tasks is None
     assert vis.quick_in_progress is None
     assert vis.merge_inited is False
-    assert vis.sel_inited is False
\ No newline at end of file
+    assert vis.sel_inited is False
+
+# ---------- Record payload mode ----------
+@pytest.mark.parametrize("algo_id", [1, 2, 3, 4, 5])
+def test_payload_records_move_with_keys(algo_id):
+    arr = [7, 3, 5, 3, 300, 1, 0, 9]
+    vis = make_vis(arr, payload_width=16)
+    run_to_completion(vis, algo_id)
+    assert list(vis.keys) == sorted(arr)
+    # every payload byte still belongs to the key it started with
+    assert (vis.dataLength["payload"] == (vis.keys % 256)[:, None]).all()
+    assert vis.bytes_moved == vis.writes * vis.dataLength.itemsize
+
+
+def test_payload_widens_swap_delay():
+    plain = make_vis([3, 2, 1])
+    wide = make_vis([3, 2, 1], payload_width=56)
+    assert plain.move_delay() == plain.delay_swap
+    assert wide.move_delay() == plain.delay_swap * 8
+
+
+def test_selection_moves_fewer_bytes_than_insertion():
+    arr = list(range(12, 0, -1))
+    sel = make_vis(arr, payload_width=64)
+    ins = make_vis(arr, payload_width=64)
+    run_to_completion(sel, 5)
+    run_to_completion(ins, 2)
+    assert sel.bytes_moved < ins.bytes_moved
+
+
+def test_reset_keeps_payload_mode():
+    vis = make_vis([4, 1, 3], payload_width=8)
+    run_to_completion(vis, 1)
+    vis.reset([9, 8])
+    assert vis.dataLength.dtype.names == ("key", "payload")
+    assert list(vis.keys) == [9, 8]
+    assert (vis.compares, vis.writes, vis.bytes_moved) == (0, 0, 0)
+
+
+# ---------- Parallel algorithms ----------
+@pytest.mark.parametrize("algo_id", [6, 7, 8])  # bitonic, odd-even merge, parallel merge
+@pytest.mark.parametrize("workers", [1, 3, 8])
+@pytest.mark.parametrize("arr", [
+    [1], [2, 1], [5, 1, 4, 2, 8, 5, 3], [2, 2, 2, 2], list(range(10, 0, -1))
+])
+def test_parallel_algorithms_sort_correctly(algo_id, workers, arr):
+    vis = make_vis(arr)
+    vis.workers = workers
+    run_to_completion(vis, algo_id)
+    assert list(vis.dataLength) == sorted(arr)
+    assert set(vis.states.tolist()) == {2}
+    assert set(vis.lanes.tolist()) == {-1}
+
+
+@pytest.mark.parametrize("algo_id", [6, 7, 8])
+def test_more_workers_take_fewer_steps(algo_id):
+    steps = []
+    for workers in (1, 4):
+        vis = make_vis(list(range(16, 0, -1)))
+        vis.workers = workers
+        vis.delay_compare = vis.delay_swap = 0
+        count = 0
+        while not vis.done:
+            vis.render_step(algo_id)
+            count += 1
+        steps.append(count)
+    assert steps[1] < steps[0]
+
+
+def test_parallel_merge_marks_worker_lanes():
+    vis = make_vis([8, 7, 6, 5, 4, 3, 2, 1])
+    vis.workers = 4
+    vis.delay_compare = vis.delay_swap = 0
+    vis.render_step(8)
+    # first level: four independent 2-element merges, one per worker
+    assert vis.lanes.tolist() == [0, 0, 1, 1, 2, 2, 3, 3]
+
+
+
+@pytest.mark.parametrize("algo_id", [6, 7, 8])
+def test_worker_count_can_change_mid_sort(algo_id):
+    arr = [9, 4, 12, 1, 7, 3, 15, 2, 8, 11, 5, 14, 6, 10, 13, 0]
+    vis = make_vis(arr)
+    vis.delay_compare = vis.delay_swap = 0
+    for workers in (2, 8, 1, 4):
+        vis.workers = workers
+        for _ in range(3):
+            vis.render_step(algo_id)
+            if algo_id == 8 and vis.pmerge_jobs is not None:
+                assert len(vis.pmerge_jobs) == workers
+            assert vis.lanes.max() < workers
+    run_to_completion(vis, algo_id)
+    assert list(vis.dataLength) == sorted(arr)
+
+# ---------- Compact state ----------
+def test_compact_dtypes_and_no_instance_dict():
+    vis = make_vis([5, 3, 1])
+    assert vis.dataLength.dtype == np.int16
+    assert vis.states.dtype == np.uint8
+    assert not hasattr(vis, "__dict__")
+    with pytest.raises(AttributeError):
+        vis.not_an_attribute = 1
+
+
+def test_reset_refills_buffers_in_place():
+    vis = make_vis([4, 1, 3, 2])
+    run_to_completion(vis, 4)
+    data, states = vis.dataLength, vis.states
+    vis.reset([8, 6, 7, 5])
+    assert vis.dataLength is data and vis.states is states
+    assert list(vis.dataLength) == [8, 6, 7, 5]
+    assert set(vis.states.tolist()) == {0}
+    # shrinking and growing back reuse the same memory
+    vis.reset([2, 1])
+    assert np.shares_memory(vis.dataLength, data)
+    vis.reset([9, 8, 7, 6, 5])
+    run_to_completion(vis, 1)
+    assert list(vis.dataLength) == [5, 6, 7, 8, 9]
+
+
+# ---------- Input distributions ----------
+def test_base_data_follows_distribution():
+    from visualization import make_base_data
+    data, name = make_base_data("sorted", 30)
+    assert name == "sorted" and list(data) == sorted(data)
+    data, name = make_base_data("reversed", 30)
+    assert list(data) == sorted(data, reverse=True)
+    data, name = make_base_data("nearly_sorted", 30)
+    assert len(data) == 30 and name == "nearly_sorted"
+    data, name = make_base_data("mixed", 30)
+    assert name in ("uniform", "sorted", "reversed", "nearly_sorted")
+    with pytest.raises(ValueError):
+        make_base_data("bimodal", 30)
+
+
+def test_out_of_range_heights_are_rejected():
+    with pytest.raises(ValueError):
+        make_vis([40000])
+    vis = make_vis([3, 2, 1])
+    with pytest.raises(ValueError):
+        vis.reset([40000, 5, -70000])
+    # the rejected data never reached the buffer
+    assert list(vis.dataLength) == [3, 2, 1]
+
+
+def test_import_writes_no_session_log(tmp_path):
+    import subprocess
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", PYTHONPATH=root)
+    subprocess.run([sys.executable, "-c", "import visualization, export"],
+                   cwd=tmp_path, env=env, check=True)
+    assert not (tmp_path / "data").exists()
@@ -5,13 +5,13 @@ import re
 import glob
 import random
 import csv
+import functools
 from config import *
 from timer import *
 from button import Button
+from parallel import merge_levels, network_pairs
 
 
-os.makedirs("data", exist_ok=True)
-
 def next_attempt_index():
     nums = []
     for p in glob.glob("data/attempt*.csv"):
@@ -20,18 +20,51 @@ def next_attempt_index():
             nums.append(int(m.group(1)))
     return (max(nums) + 1) if nums else 1
 
-ATTEMPT_IDX = next_attempt_index()
-SESSION_FILE = f"data/attempt{ATTEMPT_IDX}.csv"
-
-# Create headers if this is a new file 
-if not os.path.exists(SESSION_FILE):
-    with open(SESSION_FILE, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(["id", "time", "result"])  # columns     
+def make_base_data(distribution=dataDistribution, n=dataPoints):
+    # bar heights for one round, and the name of the distribution actually used
+    if distribution == "mixed":
+        distribution = random.choice(dataDistributions)
+    data = numpy.random.randint(10, HEIGHT - 100, n)
+    match distribution:
+        case "uniform":
+            pass
+        case "sorted":
+            data.sort()
+        case "reversed":
+            data[::-1].sort()
+        case "nearly_sorted":
+            # sorted, then about one in ten positions swapped with a random partner
+            data.sort()
+            for a in numpy.random.randint(0, n, max(1, n // 10)):
+                b = numpy.random.randint(0, n)
+                data[a], data[b] = data[b], data[a]
+        case _:
+            raise ValueError(f"unknown data distribution: {distribution}")
+    return data, distribution
+
+@functools.lru_cache(maxsize=None)
+def data_dtype(payload_width=0):
+    # bar heights fit in int16; with a payload each element is a key + payload_width bytes record
+    if payload_width <= 0:
+        return numpy.dtype(numpy.int16)
+    return numpy.dtype([("key", numpy.int16), ("payload", numpy.uint8, (payload_width,))])
 
 class Visualization:
+    # fixed attribute set: no per-instance __dict__, so many headless simulations stay small
+    __slots__ = (
+        "screen", "screen_width", "screen_height", "x_offset", "column_width", "name", "clock",
+        "payload_width", "dataLength", "keys", "move_factor", "n", "states", "lanes",
+        "_data", "_states", "_lanes", "barWidth", "gap",
+        "i", "j", "sorted_tail", "done", "delay_compare", "delay_swap", "next_step_time",
+        "padding_bottom", "compares", "writes", "bytes_moved",
+        "isSwapped", "ins_inited", "merge_inited", "merge_tasks", "merge_buffer", "finished_at",
+        "sel_inited", "sel_min_idx", "quick_tasks", "quick_in_progress",
+        "workers", "net_stages", "net_stage", "net_pos", "pmerge_levels", "pmerge_jobs",
+    )
+
     def __init__(self, dataLength, screen=win, screen_width=WIDTH, screen_height=HEIGHT,
-             x_offset=0, column_width=None, name="") -> None:
+             x_offset=0, column_width=None, name="", clock=None, payload_width=0,
+             workers=1) -> None:
         self.screen = screen
         self.screen_width = screen_width
         self.screen_height = screen_height
@@ -39,11 +72,19 @@ class Visualization:
         self.x_offset = x_offset
         self.column_width = column_width if column_width is not None else screen_width
         self.name = name
+        self.clock = clock           # optional tick source (ms); defaults to pygame ticks
 
         # data & layout
-        self.dataLength = numpy.array(dataLength, dtype=int).copy()
-        self.n = len(self.dataLength)
-        self.states = numpy.zeros((self.n,), dtype=int)  # match data length
+        self.payload_width = payload_width
+        dtype = data_dtype(payload_width)
+        # swap delay scales with record size, measured against the original 8-byte int key
+        # so race timing doesn't depend on how compactly keys are stored
+        self.move_factor = (8 + max(0, payload_width)) / 8
+        self._data = numpy.zeros((0,), dtype=dtype)   # preallocated buffers, refilled by reset()
+        self._states = numpy.zeros((0,), dtype=numpy.uint8)
+        self._lanes = numpy.zeros((0,), dtype=numpy.int16)
+        self.n = None
+        self.load(dataLength)
 
         self.barWidth = max(10, self.column_width // (self.n * 2))
         total_bar_width = self.n * self.barWidth
@@ -60,23 +101,76 @@ class Visualization:
         self.next_step_time = 0
         self.padding_bottom = 80
 
+        # cost counters
+        self.compares = 0
+        self.writes = 0
+        self.bytes_moved = 0
+
         # algo-specific flags
         self.isSwapped = False       # bubble early-exit flag (reset each pass)
         self.ins_inited = False      # insertion one-time init
         self.merge_inited = False    # merge one-time init
-        self.merge_tasks = []
+        self.merge_tasks = None
         self.merge_buffer = None
         self.finished_at = None      # pygame ticks when finished
         self.sel_inited = False      # selection one-time init
         self.sel_min_idx = 0         # min flag 
         self.quick_tasks = None
         self.quick_in_progress = None
+        self.workers = workers       # simulated cores for the parallel algorithms
+        self.net_stages = None       # bitonic / odd-even: list of (lo, hi) pair arrays
+        self.net_stage = 0
+        self.net_pos = 0
+        self.pmerge_levels = None    # parallel merge: remaining levels of (l, m, r) jobs
+        self.pmerge_jobs = None      # one active merge job (or None) per worker
+
+    def load(self, data):
+        # copy data into the preallocated buffers; they only grow when data is longer
+        data = numpy.asarray(data)
+        n = len(data)
+        limits = numpy.iinfo(numpy.int16)
+        if n and (data.min() < limits.min or data.max() > limits.max):
+            raise ValueError(f"bar heights must fit in int16 ({limits.min}..{limits.max})")
+        if n > len(self._data):
+            self._data = numpy.zeros((n,), dtype=self._data.dtype)
+            self._states = numpy.zeros((n,), dtype=numpy.uint8)
+            self._lanes = numpy.zeros((n,), dtype=numpy.int16)
+        if self.n != n:
+            # views over the buffers (the buffers themselves when the size matches)
+            full = n == len(self._data)
+            self.dataLength = self._data if full else self._data[:n]
+            self.states = self._states if full else self._states[:n]      # 0 idle, 1 active, 2 sorted
+            self.lanes = self._lanes if full else self._lanes[:n]         # worker lane per bar, -1 = idle
+            self.keys = self.dataLength["key"] if self.payload_width > 0 else self.dataLength  # view used for compares/drawing
+            self.n = n
+
+        self.keys[:] = data
+        if self.payload_width > 0:
+            self.dataLength["payload"] = (self.keys % 256)[:, None]  # tag payload with its key so moves can be checked
+        self.states[:] = 0
+        self.lanes[:] = -1
+
+    def now(self):
+        # current time in ms, from the injected clock if there is one
+        if self.clock is not None:
+            return self.clock()
+        return pygame.time.get_ticks()
+
+    def swap(self, a, b):
+        # move whole records; fancy indexing copies the right side before writing
+        self.dataLength[[a, b]] = self.dataLength[[b, a]]
+        self.writes += 2
+        self.bytes_moved += 2 * self.dataLength.itemsize
+
+    def move_delay(self):
+        # a swap takes longer the wider the record being moved
+        return int(self.delay_swap * self.move_factor)
 
     # --- Bubble Sort  ---
     def bubbleSort(self):
         if self.done:
             return
-        now = pygame.time.get_ticks()
+        now = self.now()
         if now < self.next_step_time:
             return
 
@@ -98,10 +192,11 @@ class Visualization:
         a, b = self.j, self.j + 1
         self.states[a] = self.states[b] = 1
 
-        if self.dataLength[a] > self.dataLength[b]:
-            self.dataLength[a], self.dataLength[b] = self.dataLength[b], self.dataLength[a]
+        self.compares += 1
+        if self.keys[a] > self.keys[b]:
+            self.swap(a, b)
             self.isSwapped = True
-            self.next_step_time = now + self.delay_swap
+            self.next_step_time = now + self.move_delay()
         else:
             self.next_step_time = now + self.delay_compare
 
@@ -122,7 +217,7 @@ class Visualization:
     def insertionSort(self):
         if self.done:
             return
-        now = pygame.time.get_ticks()
+        now = self.now()
         if now < self.next_step_time:
             return
 
@@ -140,7 +235,9 @@ class Visualization:
 
         self.states[:] = 0  # only highlight current pair
 
-        if self.j < 0 or self.dataLength[self.j] <= self.dataLength[self.j + 1]:
+        if self.j >= 0:
+            self.compares += 1
+        if self.j < 0 or self.keys[self.j] <= self.keys[self.j + 1]:
             self.i += 1
             if self.i >= self.n:
                 self.states[:] = 2
@@ -155,16 +252,16 @@ class Visualization:
         # compare/swap current adjacent pair
         a, b = self.j, self.j + 1
         self.states[a] = self.states[b] = 1
-        self.dataLength[a], self.dataLength[b] = self.dataLength[b], self.dataLength[a]
+        self.swap(a, b)
         self.j -= 1
-        self.next_step_time = now + self.delay_swap
+        self.next_step_time = now + self.move_delay()
 
     # --- Quick Sort Algorithm --- 
     def quickSort(self):
         if self.done:
             return
 
-        now = pygame.time.get_ticks()
+        now = self.now()
         if now < self.next_step_time:
             return
 
@@ -208,11 +305,12 @@ class Visualization:
 
         # walk j from low..high-1 comparing to pivot
         if j <= high - 1:
-            if self.dataLength[j] <= self.dataLength[pivot]:
+            self.compares += 1
+            if self.keys[j] <= self.keys[pivot]:
                 i += 1
                 # swap into place
-                self.dataLength[i], self.dataLength[j] = self.dataLength[j], self.dataLength[i]
-                self.next_step_time = now + self.delay_swap
+                self.swap(i, j)
+                self.next_step_time = now + self.move_delay()
             else:
                 self.next_step_time = now + self.delay_compare
             j += 1
@@ -221,8 +319,7 @@ class Visualization:
         else:
             # put pivot into final place at i+1
             pivot_final = i + 1
-            self.dataLength[pivot_final], self.dataLength[pivot] = \
-                self.dataLength[pivot], self.dataLength[pivot_final]
+            self.swap(pivot_final, pivot)
 
             # mark pivot_final as sorted
             if 0 <= pivot_final < self.n:
@@ -237,7 +334,7 @@ class Visualization:
 
             # done with this partition
             self.quick_in_progress = None
-            self.next_step_time = now + self.delay_swap
+            self.next_step_time = now + self.move_delay()
 
             # if no more tasks, mark complete in next frame
             if not self.quick_tasks:
@@ -246,25 +343,45 @@ class Visualization:
                 if self.finished_at is None:
                     self.finished_at = now
 
+    def merge_step(self, job):
+        # advance one merge job (l, m, r, i, j, merged) by one element;
+        # returns None once the merged block has been written back
+        l, m, r, i, j, merged = job
+
+        # merged holds source indices; records are copied out when the block is written back
+        if i <= m and j <= r:
+            self.compares += 1
+        if i <= m and (j > r or self.keys[i] <= self.keys[j]):
+            merged.append(i)
+            self.states[i] = 1
+            i += 1
+        elif j <= r:
+            merged.append(j)
+            self.states[j] = 1
+            j += 1
+        self.writes += 1
+        self.bytes_moved += self.dataLength.itemsize
+
+        # if both halves finished, add merged block back to array
+        if i > m and j > r:
+            self.dataLength[l:l + len(merged)] = self.dataLength[merged]
+            self.writes += len(merged)
+            self.bytes_moved += len(merged) * self.dataLength.itemsize
+            return None
+        return (l, m, r, i, j, merged)
+
     # --- Merge Sort Algorithm ---
     def mergeSort(self):
         if self.done:
             return
-        now = pygame.time.get_ticks()
+        now = self.now()
         if now < self.next_step_time:
             return
 
         # one-time setup (first frame)
         if not self.merge_inited:
-            # generate all merge jobs for progressively larger block sizes (bottom-up)
-            size = 1
-            while size < self.n:
-                for left in range(0, self.n, 2*size):
-                    mid = min(left + size - 1, self.n - 1)
-                    right = min(left + 2*size - 1, self.n - 1)
-                    if mid < right:
-                        self.merge_tasks.append((left, mid, right))
-                size *= 2
+            # all merge jobs for progressively larger block sizes (bottom-up)
+            self.merge_tasks = [job for level in merge_levels(self.n) for job in level]
             self.merge_inited = True
 
         # if no jobs, mark as complete
@@ -280,38 +397,117 @@ class Visualization:
             l, m, r = self.merge_tasks[0]
             self.merge_buffer = (l, m, r, l, m+1, [])
 
-        # unpack state for ongoing merge
-        l, m, r, i, j, merged = self.merge_buffer
-
         # elements being compared for visualization
         self.states[:] = 0
-        if i <= m and (j > r or self.dataLength[i] <= self.dataLength[j]):
-            merged.append(self.dataLength[i])
-            self.states[i] = 1
-            i += 1
-        elif j <= r:
-            merged.append(self.dataLength[j])
-            self.states[j] = 1
-            j += 1
-
-        # if both halves finished, add merged block back to array
-        if i > m and j > r:
-            for k, val in enumerate(merged):
-                self.dataLength[l + k] = val
+        self.merge_buffer = self.merge_step(self.merge_buffer)
+        if self.merge_buffer is None:
             self.merge_tasks.pop(0)
-            self.merge_buffer = None
-        else:
-            # otherwise continue next frame
-            self.merge_buffer = (l, m, r, i, j, merged)
 
         # frames delay
-        self.next_step_time = now + self.delay_swap
-        
+        self.next_step_time = now + self.move_delay()
+
+    # --- Parallel Merge Sort ---
+    def parallelMergeSort(self):
+        if self.done:
+            return
+        now = self.now()
+        if now < self.next_step_time:
+            return
+
+        # one-time setup: same jobs as mergeSort, kept per level so a level can run side by side
+        if self.pmerge_levels is None:
+            self.pmerge_levels = merge_levels(self.n)
+            self.pmerge_jobs = [None] * self.workers
+
+        # the core count can change between steps (setWorkers): keep one slot per worker and
+        # park jobs left without a worker at the front of their level, to resume where they stopped
+        if len(self.pmerge_jobs) != self.workers:
+            active = [job for job in self.pmerge_jobs if job is not None]
+            self.pmerge_jobs = active[:self.workers] + [None] * max(0, self.workers - len(active))
+            if active[self.workers:]:
+                self.pmerge_levels[0][:0] = active[self.workers:]
+
+        # hand idle workers the next job of the current level; only move on once it drains
+        while self.pmerge_levels and not self.pmerge_levels[0] and not any(self.pmerge_jobs):
+            self.pmerge_levels.pop(0)
+        if self.pmerge_levels:
+            level = self.pmerge_levels[0]
+            for w in range(self.workers):
+                if self.pmerge_jobs[w] is None and level:
+                    job = level.pop(0)
+                    if len(job) == 3:
+                        l, m, r = job
+                        job = (l, m, r, l, m+1, [])
+                    self.pmerge_jobs[w] = job
+
+        if not any(self.pmerge_jobs):
+            self.states[:] = 2
+            self.lanes[:] = -1
+            self.done = True
+            if self.finished_at is None:
+                self.finished_at = now
+            return
+
+        # every worker advances its own job by one element this frame
+        self.states[:] = 0
+        self.lanes[:] = -1
+        for w, job in enumerate(self.pmerge_jobs):
+            if job is not None:
+                self.lanes[job[0]:job[2] + 1] = w
+                self.pmerge_jobs[w] = self.merge_step(job)
+
+        self.next_step_time = now + self.move_delay()
+
+    # --- Bitonic / Odd-even merge sort (sorting networks) ---
+    def networkSort(self, network):
+        if self.done:
+            return
+        now = self.now()
+        if now < self.next_step_time:
+            return
+
+        # one-time setup: stages of disjoint compare-exchange pairs
+        if self.net_stages is None:
+            self.net_stages = network_pairs(network, self.n)
+            self.net_stage = 0
+            self.net_pos = 0
+
+        # skip finished (or empty) stages
+        while self.net_stage < len(self.net_stages) and self.net_pos >= len(self.net_stages[self.net_stage][0]):
+            self.net_stage += 1
+            self.net_pos = 0
+
+        if self.net_stage >= len(self.net_stages):
+            self.states[:] = 2
+            self.lanes[:] = -1
+            self.done = True
+            if self.finished_at is None:
+                self.finished_at = now
+            return
+
+        # each worker runs one compare-exchange of the current stage this frame
+        lo, hi = self.net_stages[self.net_stage]
+        end = min(self.net_pos + self.workers, len(lo))
+        self.states[:] = 0
+        self.lanes[:] = -1
+        swapped = False
+        for w, k in enumerate(range(self.net_pos, end)):
+            a, b = int(lo[k]), int(hi[k])
+            self.states[a] = self.states[b] = 1
+            self.lanes[a] = self.lanes[b] = w
+            self.compares += 1
+            if self.keys[a] > self.keys[b]:
+                self.swap(a, b)
+                swapped = True
+        self.net_pos = end
+
+        self.next_step_time = now + (self.move_delay() if swapped else self.delay_compare)
+
     # --- selection sort ---   
     def selectionSort(self):
         if self.done:
             return
-        now = pygame.time.get_ticks()
+        now = self.now()
         if now < self.next_step_time:
             return
 
@@ -336,14 +532,13 @@ class Visualization:
         # end of scan → swap min into position i
         if self.j >= self.n:
             if self.sel_min_idx != self.i:
-                self.dataLength[self.i], self.dataLength[self.sel_min_idx] = \
-                    self.dataLength[self.sel_min_idx], self.dataLength[self.i]
+                self.swap(self.i, self.sel_min_idx)
                 # highlight swap pair
                 self.states[self.i] = self.states[self.sel_min_idx] = 1
                 self.i += 1
                 self.j = self.i + 1
                 self.sel_min_idx = self.i
-                self.next_step_time = now + self.delay_swap
+                self.next_step_time = now + self.move_delay()
                 return
             else:
                 # no swap needed
@@ -358,7 +553,8 @@ class Visualization:
         self.states[self.sel_min_idx] = 1
         self.states[self.j] = 1
 
-        if self.dataLength[self.j] < self.dataLength[self.sel_min_idx]:
+        self.compares += 1
+        if self.keys[self.j] < self.keys[self.sel_min_idx]:
             self.sel_min_idx = self.j  # new min found
 
         self.j += 1
@@ -366,9 +562,7 @@ class Visualization:
 
     # --- Reset the data --- 
     def reset(self, data):
-        self.dataLength = numpy.array(data, dtype=int).copy()
-        self.n = len(self.dataLength)
-        self.states = numpy.zeros((self.n,), dtype=int)
+        self.load(data)
         self.i = 0; self.j = 0
         self.sorted_tail = self.n
         self.done = False
@@ -379,21 +573,37 @@ class Visualization:
         self.delay_swap = 200
         self.delay_compare = 200
         self.merge_inited = False
-        self.merge_tasks = []
+        self.merge_tasks = None
         self.merge_buffer = None
         self.sel_inited = False
         self.sel_min_idx = 0
         self.quick_tasks = None
         self.quick_in_progress = None
+        self.compares = 0
+        self.writes = 0
+        self.bytes_moved = 0
+        self.net_stages = None
+        self.net_stage = 0
+        self.net_pos = 0
+        self.pmerge_levels = None
+        self.pmerge_jobs = None
 
     def draw_bars(self):
         for i in range(len(self.dataLength)):
             x = self.x_offset + self.gap * (i + 1) + self.barWidth * i
+            h = int(self.keys[i])
             color = WHITE if self.states[i] == 0 else (RED if self.states[i] == 1 else GREEN)
             pygame.draw.rect(
                 self.screen, color,
-                (x, self.screen_height - self.dataLength[i] -self.padding_bottom, self.barWidth, self.dataLength[i])
+                (x, self.screen_height - h -self.padding_bottom, self.barWidth, h)
             )
+            # worker lane strip under the bar (parallel algorithms only)
+            if self.lanes[i] >= 0:
+                lane_color = LANE_COLORS[self.lanes[i] % len(LANE_COLORS)]
+                pygame.draw.rect(
+                    self.screen, lane_color,
+                    (x, self.screen_height - self.padding_bottom + 2, self.barWidth, 6)
+                )
 
     def render_step(self, random):
         match random:
@@ -412,6 +622,15 @@ class Visualization:
             case 5:
                 self.selectionSort()
                 self.name = "Selection sort"
+            case 6:
+                self.networkSort("bitonic")
+                self.name = f"Bitonic sort ({self.cores_label()})"
+            case 7:
+                self.networkSort("odd_even")
+                self.name = f"Odd-even merge sort ({self.cores_label()})"
+            case 8:
+                self.parallelMergeSort()
+                self.name = f"Parallel merge sort ({self.cores_label()})"
         self.draw_bars()
 
     # --- will remove this in the future ---
@@ -420,6 +639,13 @@ class Visualization:
         label = font.render(f"{self.name}", True, WHITE)
         self.screen.blit(label, (self.x_offset + 10, 10))
 
+    def cores_label(self):
+        return f"{self.workers} core" if self.workers == 1 else f"{self.workers} cores"
+
+    def setWorkers(self, algo):
+        # parallel algorithms race with a random core count; the rest run on one
+        self.workers = random.choice(coreChoices) if algo in parallelAlgorithms else 1
+
     def speedUp(self):
         self.delay_compare = 10
         self.delay_swap = 10
@@ -443,13 +669,25 @@ def _run_game():
     pending_time_s = None
     attempt_line_id = 1  
 
-    base_data = numpy.random.randint(10, HEIGHT - 100, dataPoints)
+    # one log per game session; created here so importing this module writes nothing
+    os.makedirs("data", exist_ok=True)
+    session_file = f"data/attempt{next_attempt_index()}.csv"
+
+    # Create headers if this is a new file 
+    if not os.path.exists(session_file):
+        with open(session_file, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["id", "time", "result", "left", "right", "distribution"])  # columns     
+
+    base_data, distribution = make_base_data()
 
     left_width = WIDTH // 2
     right_width = WIDTH - left_width
 
-    left_vis = Visualization(dataLength=base_data, x_offset=0, column_width=left_width)
-    right_vis = Visualization(dataLength=base_data, x_offset=left_width, column_width=right_width)
+    left_vis = Visualization(dataLength=base_data, x_offset=0, column_width=left_width,
+                             payload_width=payloadWidth)
+    right_vis = Visualization(dataLength=base_data, x_offset=left_width, column_width=right_width,
+                              payload_width=payloadWidth)
 
     left_rect  = pygame.Rect(0, 0, left_width, HEIGHT - 80)          # exclude bottom padding
     right_rect = pygame.Rect(left_width, 0, right_width, HEIGHT - 80)
@@ -480,10 +718,12 @@ def _run_game():
                 result_printed = False
                 pending_time_s = None
                 left_algo, right_algo = random.sample(algorithms, 2)
+                left_vis.setWorkers(left_algo)
+                right_vis.setWorkers(right_algo)
 
             # Reset round 
             if reset_button.is_clicked(event):
-                base_data = numpy.random.randint(10, HEIGHT - 100, dataPoints)
+                base_data, distribution = make_base_data()
                 left_vis.reset(base_data)
                 right_vis.reset(base_data)
                 start_visualize = False
@@ -544,9 +784,10 @@ def _run_game():
                         result_text = "Correct!" if prediction == winner else f"Incorrect — {winner} finished first"
                     # append CSV row: id,time,result  (pending_time_s is reaction time at click)
                     if pending_time_s is not None:
-                        with open(SESSION_FILE, "a", newline="", encoding="utf-8") as f:
+                        with open(session_file, "a", newline="", encoding="utf-8") as f:
                             writer = csv.writer(f)
-                            writer.writerow([attempt_line_id, f"{pending_time_s:.3f}", "Correct" if result_text.startswith("Correct") else ("Tie" if winner == "tie" else "Incorrect")])
+                            writer.writerow([attempt_line_id, f"{pending_time_s:.3f}", "Correct" if result_text.startswith("Correct") else ("Tie" if winner == "tie" else "Incorrect"),
+                                             left_vis.name, right_vis.name, distribution])
                         attempt_line_id += 1
                         pending_time_s = None
                     result_printed = True